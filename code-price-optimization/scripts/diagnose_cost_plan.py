@@ -3,16 +3,79 @@
 
 from __future__ import annotations
 
-import argparse
 import json
-from typing import Dict, List, Set
+import math
+import sys
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-EEA_COUNTRIES = {
+
+EEA_COUNTRIES = frozenset({
     "AT", "BE", "BG", "HR", "CY", "CZ", "DK", "EE", "FI", "FR", "DE", "GR",
     "HU", "IS", "IE", "IT", "LV", "LI", "LT", "LU", "MT", "NL", "NO", "PL",
     "PT", "RO", "SK", "SI", "ES", "SE", "UK",
-}
+})
+
+SYSTEM_API_SAAS = "api-saas"
+SYSTEM_DATA_PLATFORM = "data-platform"
+SYSTEM_EDGE_IOT = "edge-iot"
+
+RESTRICTION_DATA_RESIDENCY = "data-residency"
+RESTRICTION_PCI = "pci"
+RESTRICTION_HIPAA = "hipaa"
+RESTRICTION_FEDRAMP = "fedramp"
+RESTRICTION_SOC2 = "soc2"
+REGULATED_RESTRICTIONS = frozenset({RESTRICTION_PCI, RESTRICTION_HIPAA, RESTRICTION_FEDRAMP})
+COMPANY_SIZES = ("solo", "startup", "smb", "mid-market", "enterprise")
+SMALL_COMPANY_SIZES = frozenset({"solo", "startup"})
+COMMITMENT_TIERS = frozenset({"growth", "enterprise"})
+
+TIER_BOUNDS_USD = (2000.0, 20000.0, 150000.0)
+TIER_NAMES = ("micro", "startup", "growth", "enterprise")
+
+
+@dataclass(slots=True)
+class CostInputs:
+    monthly_budget_usd: float = 0.0
+    company_size: str = "startup"
+    system_types: Set[str] = field(default_factory=lambda: {SYSTEM_API_SAAS})
+    restrictions: Set[str] = field(default_factory=set)
+    clouds: Set[str] = field(default_factory=lambda: {"aws"})
+    country: str = "US"
+    monthly_requests: float = 0.0
+    monthly_compute_hours: float = 0.0
+    monthly_storage_gb: float = 0.0
+    monthly_egress_gb: float = 0.0
+    preload_ratio: float = 0.0
+    postman_seats: int = 0
+
+    def __post_init__(self) -> None:
+        if self.company_size not in COMPANY_SIZES:
+            raise ValueError(
+                f"company_size must be one of {', '.join(COMPANY_SIZES)}; got {self.company_size!r}"
+            )
+        for name in (
+            "monthly_budget_usd",
+            "monthly_requests",
+            "monthly_compute_hours",
+            "monthly_storage_gb",
+            "monthly_egress_gb",
+            "preload_ratio",
+        ):
+            if not math.isfinite(getattr(self, name)):
+                raise ValueError(f"{name} must be a finite number")
+        self.system_types = normalize_set(self.system_types)
+        self.restrictions = normalize_set(self.restrictions)
+        self.clouds = normalize_set(self.clouds)
+        self.country = self.country.upper()
+        self.preload_ratio = min(max(self.preload_ratio, 0.0), 1.0)
 
 
 def parse_csv_set(raw: str) -> Set[str]:
@@ -21,284 +84,226 @@ def parse_csv_set(raw: str) -> Set[str]:
     return {part.strip().lower() for part in raw.split(",") if part.strip()}
 
 
+def normalize_set(values: Union[str, Iterable[str]]) -> Set[str]:
+    if isinstance(values, str):
+        return parse_csv_set(values)
+    return {value.strip().lower() for value in values if value.strip()}
+
+
+def finite_float(raw: str) -> float:
+    value = float(raw)
+    if not math.isfinite(value):
+        raise ValueError(f"expected a finite number, got {raw!r}")
+    return value
+
+
 def budget_tier(monthly_budget_usd: float) -> str:
     if monthly_budget_usd <= 0:
         return "unknown"
-    if monthly_budget_usd < 2000:
-        return "micro"
-    if monthly_budget_usd < 20000:
-        return "startup"
-    if monthly_budget_usd < 150000:
-        return "growth"
-    return "enterprise"
-
-
-def add_unique(items: List[str], additions: List[str]) -> None:
-    seen = set(items)
-    for addition in additions:
-        if addition not in seen:
-            seen.add(addition)
-            items.append(addition)
-
-
-def add_action(
-    actions: List[Dict[str, object]],
-    dedupe: Set[str],
-    key: str,
-    priority: int,
-    title: str,
-    reason: str,
-    steps: List[str],
-) -> None:
-    if key in dedupe:
-        return
-    dedupe.add(key)
-    actions.append(
-        {
-            "priority": priority,
-            "title": title,
-            "reason": reason,
-            "steps": steps,
-        }
-    )
+    return TIER_NAMES[bisect_right(TIER_BOUNDS_USD, monthly_budget_usd)]
+
 
+class Action(NamedTuple):
+    priority: int
+    title: str
+    reason: str
+    steps: Tuple[str, ...]
 
-def build_actions(args: argparse.Namespace, tier: str) -> List[Dict[str, object]]:
-    actions: List[Dict[str, object]] = []
-    dedupe: Set[str] = set()
 
-    add_action(
-        actions,
-        dedupe,
-        "focus",
+ActionPredicate = Callable[[CostInputs, str, bool], bool]
+
+# (priority, title, reason, steps, predicate(inputs, tier, is_eea))
+_ACTION_TABLE: Tuple[
+    Tuple[int, str, str, Tuple[str, ...], ActionPredicate], ...
+] = (
+    (
         10,
         "Normalize billing data with FOCUS-aligned fields",
         "Comparisons and chargeback stay noisy without a shared schema.",
-        [
+        (
             "Export raw billing data from each cloud account/project/subscription daily.",
             "Map provider fields to FOCUS dimensions and enforce tag completeness.",
             "Track cost per 1M requests, cost per active user, and egress per 1K requests.",
-        ],
-    )
-
-    add_action(
-        actions,
-        dedupe,
-        "alerts",
+        ),
+        lambda a, t, e: True,
+    ),
+    (
         20,
         "Enable budget and anomaly alerts in all billing scopes",
         "Alerting catches runaway costs before end-of-month surprises.",
-        [
+        (
             "Create monthly budgets per workload and environment.",
             "Add anomaly alerts for sudden request, egress, and log-ingest spikes.",
             "Route alerts to the owning team and on-call channel.",
-        ],
-    )
-
-    add_action(
-        actions,
-        dedupe,
-        "idle",
+        ),
+        lambda a, t, e: True,
+    ),
+    (
         30,
         "Eliminate idle compute and storage",
         "Idle resources are usually the fastest savings lever.",
-        [
+        (
             "Shut down non-production stacks outside business hours.",
             "Right-size over-provisioned instances and databases.",
             "Apply storage lifecycle policies for cold data.",
-        ],
-    )
-
-    if args.monthly_requests > 0 and args.monthly_compute_hours > 0:
-        requests_per_compute_hour = args.monthly_requests / args.monthly_compute_hours
-        if requests_per_compute_hour < 1500:
-            add_action(
-                actions,
-                dedupe,
-                "low-utilization",
-                35,
-                "Improve compute utilization",
-                "Request throughput per compute hour is low for sustained workloads.",
-                [
-                    "Increase autoscaling aggressiveness and shrink baseline capacity.",
-                    "Move burst-heavy endpoints to serverless where feasible.",
-                    "Benchmark critical paths before and after rightsizing.",
-                ],
-            )
-
-    if args.preload_ratio >= 0.25:
-        add_action(
-            actions,
-            dedupe,
-            "preload",
-            40,
-            "Reduce unnecessary data preloading",
-            "High preload ratio increases compute, DB, and bandwidth costs.",
-            [
-                "Switch from eager preload to demand-driven fetch for low-hit datasets.",
-                "Set TTL and invalidation rules for preloaded caches.",
-                "Measure preload hit-rate; remove preload paths below 60% hit-rate.",
-            ],
-        )
-
-    if args.monthly_requests >= 10_000_000:
-        add_action(
-            actions,
-            dedupe,
-            "request-shaping",
-            45,
-            "Apply request shaping and API efficiency controls",
-            "Large request volumes amplify small inefficiencies.",
-            [
-                "Add response caching on high-read endpoints.",
-                "Set client retry budgets and exponential backoff.",
-                "Add rate limits and idempotency keys for expensive writes.",
-            ],
-        )
-
-    if args.monthly_egress_gb >= 2000:
-        add_action(
-            actions,
-            dedupe,
-            "egress",
-            50,
-            "Cut bandwidth and egress costs",
-            "Egress-heavy traffic is often reducible with cache and payload controls.",
-            [
-                "Move static and cacheable traffic behind CDN edge caching.",
-                "Compress payloads and remove unused fields from responses.",
-                "Review cross-region data paths and keep read traffic local.",
-            ],
-        )
-
-    if args.country.upper() in EEA_COUNTRIES or "data-residency" in args.restrictions:
-        add_action(
-            actions,
-            dedupe,
-            "residency",
-            60,
-            "Lock workload placement to compliant regions",
-            "Country and residency constraints can invalidate low-cost region choices.",
-            [
-                "Pin data-plane services to approved regions first.",
-                "Separate control-plane and analytics workloads when permitted.",
-                "Recalculate egress assumptions after compliant region placement.",
-            ],
-        )
-
-    if args.company_size in {"solo", "startup"}:
-        add_action(
-            actions,
-            dedupe,
-            "tooling-seats",
-            70,
-            "Tighten paid tooling and seat governance",
-            "Early-stage teams often overpay for inactive collaboration/tool seats.",
-            [
-                "Audit seats monthly and reclaim inactive users.",
-                "Downgrade non-critical users to lighter plans.",
-                "Standardize on one API workspace unless segregation is required.",
-            ],
-        )
-
-    if args.postman_seats > 10:
-        add_action(
-            actions,
-            dedupe,
-            "postman",
-            75,
-            "Review Postman workspace and seat utilization",
-            "Seat-heavy API tooling spend should be usage-justified.",
-            [
-                "Group users by role: author, reviewer, consumer.",
-                "Keep paid author seats only for active API producers.",
-                "Archive inactive workspaces and remove duplicate collections.",
-            ],
-        )
-
-    if tier in {"growth", "enterprise"}:
-        add_action(
-            actions,
-            dedupe,
-            "commitments",
-            80,
-            "Use commitments for stable baselines",
-            "Steady workloads are usually cheaper under commitment programs.",
-            [
-                "Measure 4-8 weeks of baseline demand before buying commitments.",
-                "Buy commitments for steady-state layers, keep burst on demand.",
-                "Review unused commitment coverage monthly.",
-            ],
-        )
-
-    if "api-saas" in args.system_types:
-        add_action(
-            actions,
-            dedupe,
-            "api-saas",
-            85,
-            "Optimize API read patterns and cache strategy",
-            "API SaaS economics are highly sensitive to request-path efficiency.",
-            [
-                "Split hot and cold endpoints and tune cache TTL per path.",
-                "Prefer projection queries over full payload retrieval.",
-                "Track p95 endpoint cost per 10K calls.",
-            ],
-        )
-
-    if "data-platform" in args.system_types:
-        add_action(
-            actions,
-            dedupe,
-            "data-platform",
-            90,
-            "Optimize analytical storage and scan costs",
-            "Data-platform spend grows quickly without lifecycle and pruning controls.",
-            [
-                "Partition large tables and enforce query pruning.",
-                "Move cold data to cheaper storage tiers.",
-                "Set per-team query spend quotas and alert thresholds.",
-            ],
-        )
-
-    if "edge-iot" in args.system_types:
-        add_action(
-            actions,
-            dedupe,
-            "edge-iot",
-            95,
-            "Batch and compress edge telemetry",
-            "Edge workloads commonly overspend on transport and message volume.",
-            [
-                "Batch telemetry where latency budgets allow.",
-                "Use compact payload formats and compression.",
-                "Drop redundant heartbeat frequency where safe.",
-            ],
-        )
-
-    if any(r in args.restrictions for r in {"pci", "hipaa", "fedramp"}):
-        add_action(
-            actions,
-            dedupe,
-            "regulated",
-            100,
-            "Model compliance boundary costs explicitly",
-            "Regulated workloads need architecture choices that change cost shape.",
-            [
-                "Separate compliant and non-compliant workloads into clear boundaries.",
-                "Measure incremental controls cost per product line.",
-                "Prefer managed controls where they reduce audit and ops overhead.",
-            ],
-        )
-
-    actions.sort(key=lambda item: int(item["priority"]))
+        ),
+        lambda a, t, e: True,
+    ),
+    (
+        35,
+        "Improve compute utilization",
+        "Request throughput per compute hour is low for sustained workloads.",
+        (
+            "Increase autoscaling aggressiveness and shrink baseline capacity.",
+            "Move burst-heavy endpoints to serverless where feasible.",
+            "Benchmark critical paths before and after rightsizing.",
+        ),
+        lambda a, t, e: (
+            a.monthly_requests > 0
+            and a.monthly_compute_hours > 0
+            and a.monthly_requests / a.monthly_compute_hours < 1500
+        ),
+    ),
+    (
+        40,
+        "Reduce unnecessary data preloading",
+        "High preload ratio increases compute, DB, and bandwidth costs.",
+        (
+            "Switch from eager preload to demand-driven fetch for low-hit datasets.",
+            "Set TTL and invalidation rules for preloaded caches.",
+            "Measure preload hit-rate; remove preload paths below 60% hit-rate.",
+        ),
+        lambda a, t, e: a.preload_ratio >= 0.25,
+    ),
+    (
+        45,
+        "Apply request shaping and API efficiency controls",
+        "Large request volumes amplify small inefficiencies.",
+        (
+            "Add response caching on high-read endpoints.",
+            "Set client retry budgets and exponential backoff.",
+            "Add rate limits and idempotency keys for expensive writes.",
+        ),
+        lambda a, t, e: a.monthly_requests >= 10_000_000,
+    ),
+    (
+        50,
+        "Cut bandwidth and egress costs",
+        "Egress-heavy traffic is often reducible with cache and payload controls.",
+        (
+            "Move static and cacheable traffic behind CDN edge caching.",
+            "Compress payloads and remove unused fields from responses.",
+            "Review cross-region data paths and keep read traffic local.",
+        ),
+        lambda a, t, e: a.monthly_egress_gb >= 2000,
+    ),
+    (
+        60,
+        "Lock workload placement to compliant regions",
+        "Country and residency constraints can invalidate low-cost region choices.",
+        (
+            "Pin data-plane services to approved regions first.",
+            "Separate control-plane and analytics workloads when permitted.",
+            "Recalculate egress assumptions after compliant region placement.",
+        ),
+        lambda a, t, e: e or RESTRICTION_DATA_RESIDENCY in a.restrictions,
+    ),
+    (
+        70,
+        "Tighten paid tooling and seat governance",
+        "Early-stage teams often overpay for inactive collaboration/tool seats.",
+        (
+            "Audit seats monthly and reclaim inactive users.",
+            "Downgrade non-critical users to lighter plans.",
+            "Standardize on one API workspace unless segregation is required.",
+        ),
+        lambda a, t, e: a.company_size in SMALL_COMPANY_SIZES,
+    ),
+    (
+        75,
+        "Review Postman workspace and seat utilization",
+        "Seat-heavy API tooling spend should be usage-justified.",
+        (
+            "Group users by role: author, reviewer, consumer.",
+            "Keep paid author seats only for active API producers.",
+            "Archive inactive workspaces and remove duplicate collections.",
+        ),
+        lambda a, t, e: a.postman_seats > 10,
+    ),
+    (
+        80,
+        "Use commitments for stable baselines",
+        "Steady workloads are usually cheaper under commitment programs.",
+        (
+            "Measure 4-8 weeks of baseline demand before buying commitments.",
+            "Buy commitments for steady-state layers, keep burst on demand.",
+            "Review unused commitment coverage monthly.",
+        ),
+        lambda a, t, e: t in COMMITMENT_TIERS,
+    ),
+    (
+        85,
+        "Optimize API read patterns and cache strategy",
+        "API SaaS economics are highly sensitive to request-path efficiency.",
+        (
+            "Split hot and cold endpoints and tune cache TTL per path.",
+            "Prefer projection queries over full payload retrieval.",
+            "Track p95 endpoint cost per 10K calls.",
+        ),
+        lambda a, t, e: SYSTEM_API_SAAS in a.system_types,
+    ),
+    (
+        90,
+        "Optimize analytical storage and scan costs",
+        "Data-platform spend grows quickly without lifecycle and pruning controls.",
+        (
+            "Partition large tables and enforce query pruning.",
+            "Move cold data to cheaper storage tiers.",
+            "Set per-team query spend quotas and alert thresholds.",
+        ),
+        lambda a, t, e: SYSTEM_DATA_PLATFORM in a.system_types,
+    ),
+    (
+        95,
+        "Batch and compress edge telemetry",
+        "Edge workloads commonly overspend on transport and message volume.",
+        (
+            "Batch telemetry where latency budgets allow.",
+            "Use compact payload formats and compression.",
+            "Drop redundant heartbeat frequency where safe.",
+        ),
+        lambda a, t, e: SYSTEM_EDGE_IOT in a.system_types,
+    ),
+    (
+        100,
+        "Model compliance boundary costs explicitly",
+        "Regulated workloads need architecture choices that change cost shape.",
+        (
+            "Separate compliant and non-compliant workloads into clear boundaries.",
+            "Measure incremental controls cost per product line.",
+            "Prefer managed controls where they reduce audit and ops overhead.",
+        ),
+        lambda a, t, e: bool(a.restrictions & REGULATED_RESTRICTIONS),
+    ),
+)
+
+
+def build_actions(inputs: CostInputs, tier: str, is_eea: bool) -> List[Action]:
+    actions = [
+        Action(priority, title, reason, steps)
+        for priority, title, reason, steps, predicate in _ACTION_TABLE
+        if predicate(inputs, tier, is_eea)
+    ]
+    actions.sort(key=attrgetter("priority"))
     return actions
 
 
-def phase_actions(actions: List[Dict[str, object]]) -> Dict[str, List[str]]:
-    immediate = [a["title"] for a in actions[:4]]
-    medium = [a["title"] for a in actions[4:9]]
-    follow_up = [a["title"] for a in actions[9:]]
+def phase_actions(actions: List[Action]) -> Dict[str, List[str]]:
+    immediate: List[str] = []
+    medium: List[str] = []
+    follow_up: List[str] = []
+    for idx, action in enumerate(actions):
+        (immediate if idx < 4 else medium if idx < 9 else follow_up).append(action.title)
     return {
         "0-14_days": immediate,
         "15-45_days": medium,
@@ -306,39 +311,39 @@ def phase_actions(actions: List[Dict[str, object]]) -> Dict[str, List[str]]:
     }
 
 
-def build_summary(args: argparse.Namespace, tier: str) -> Dict[str, object]:
+def build_summary(inputs: CostInputs, tier: str, is_eea: bool) -> Dict[str, object]:
     req_per_compute_hour = None
-    if args.monthly_requests > 0 and args.monthly_compute_hours > 0:
-        req_per_compute_hour = round(args.monthly_requests / args.monthly_compute_hours, 2)
+    if inputs.monthly_requests > 0 and inputs.monthly_compute_hours > 0:
+        req_per_compute_hour = round(inputs.monthly_requests / inputs.monthly_compute_hours, 2)
 
     egress_per_1k_requests_mb = None
-    if args.monthly_requests > 0 and args.monthly_egress_gb > 0:
-        total_mb = args.monthly_egress_gb * 1024
-        egress_per_1k_requests_mb = round((total_mb / args.monthly_requests) * 1000, 4)
+    if inputs.monthly_requests > 0 and inputs.monthly_egress_gb > 0:
+        total_mb = inputs.monthly_egress_gb * 1024
+        egress_per_1k_requests_mb = round((total_mb / inputs.monthly_requests) * 1000, 4)
 
     cost_per_1m_requests = None
-    if args.monthly_requests > 0 and args.monthly_budget_usd > 0:
-        cost_per_1m_requests = round(args.monthly_budget_usd / (args.monthly_requests / 1_000_000), 2)
-
-    signals: List[str] = []
-    if args.preload_ratio >= 0.25:
-        signals.append("high_preload_ratio")
-    if args.monthly_egress_gb >= 2000:
-        signals.append("high_egress")
-    if args.monthly_requests >= 10_000_000:
-        signals.append("high_request_volume")
-    if args.postman_seats > 10:
-        signals.append("tool_seat_growth")
-    if args.country.upper() in EEA_COUNTRIES or "data-residency" in args.restrictions:
-        signals.append("residency_sensitive")
+    if inputs.monthly_requests > 0 and inputs.monthly_budget_usd > 0:
+        cost_per_1m_requests = round(inputs.monthly_budget_usd / (inputs.monthly_requests / 1_000_000), 2)
+
+    signals = [
+        name
+        for triggered, name in (
+            (inputs.preload_ratio >= 0.25, "high_preload_ratio"),
+            (inputs.monthly_egress_gb >= 2000, "high_egress"),
+            (inputs.monthly_requests >= 10_000_000, "high_request_volume"),
+            (inputs.postman_seats > 10, "tool_seat_growth"),
+            (is_eea or RESTRICTION_DATA_RESIDENCY in inputs.restrictions, "residency_sensitive"),
+        )
+        if triggered
+    ]
 
     return {
         "budget_tier": tier,
-        "country": args.country.upper(),
-        "company_size": args.company_size,
-        "system_types": sorted(args.system_types),
-        "restrictions": sorted(args.restrictions),
-        "clouds": sorted(args.clouds),
+        "country": inputs.country,
+        "company_size": inputs.company_size,
+        "system_types": sorted(inputs.system_types),
+        "restrictions": sorted(inputs.restrictions),
+        "clouds": sorted(inputs.clouds),
         "requests_per_compute_hour": req_per_compute_hour,
         "egress_mb_per_1k_requests": egress_per_1k_requests_mb,
         "cost_per_1m_requests_usd": cost_per_1m_requests,
@@ -346,7 +351,7 @@ def build_summary(args: argparse.Namespace, tier: str) -> Dict[str, object]:
     }
 
 
-def build_correct_practices(args: argparse.Namespace) -> Dict[str, List[str]]:
+def build_correct_practices(inputs: CostInputs, is_eea: bool) -> Dict[str, List[str]]:
     do_items = [
         "Track core unit metrics weekly: cost/1M requests, cost/active user, egress/1K requests.",
         "Require consistent tagging and ownership on production resources.",
@@ -362,103 +367,127 @@ def build_correct_practices(args: argparse.Namespace) -> Dict[str, List[str]]:
         "Budget variance by workload",
         "Requests per compute hour",
     ]
-
-    if args.preload_ratio >= 0.25:
-        add_unique(
+    do_seen = set(do_items)
+    avoid_seen = set(avoid_items)
+    measure_seen = set(measure_items)
+
+    def push(items: List[str], seen: Set[str], additions: List[str]) -> None:
+        for addition in additions:
+            if addition not in seen:
+                seen.add(addition)
+                items.append(addition)
+
+    if inputs.preload_ratio >= 0.25:
+        push(
             do_items,
+            do_seen,
             [
                 "Move low-hit preload flows to demand fetch and enforce cache TTL rules.",
             ],
         )
-        add_unique(
+        push(
             avoid_items,
+            avoid_seen,
             [
                 "Do not preload low-hit datasets by default.",
             ],
         )
-        add_unique(
+        push(
             measure_items,
+            measure_seen,
             [
                 "Preload hit-rate",
             ],
         )
 
-    if args.monthly_egress_gb >= 2000:
-        add_unique(
+    if inputs.monthly_egress_gb >= 2000:
+        push(
             do_items,
+            do_seen,
             [
                 "Route static and cacheable traffic through CDN with compression enabled.",
             ],
         )
-        add_unique(
+        push(
             avoid_items,
+            avoid_seen,
             [
                 "Do not keep cross-region reads as default where in-region serving is viable.",
             ],
         )
-        add_unique(
+        push(
             measure_items,
+            measure_seen,
             [
                 "Egress MB per 1K requests",
                 "CDN offload percentage",
             ],
         )
 
-    if args.postman_seats > 10:
-        add_unique(
+    if inputs.postman_seats > 10:
+        push(
             do_items,
+            do_seen,
             [
                 "Role-segment API tooling seats and keep paid author seats for active producers.",
             ],
         )
-        add_unique(
+        push(
             avoid_items,
+            avoid_seen,
             [
                 "Do not keep duplicated workspaces and stale collections indefinitely.",
             ],
         )
-        add_unique(
+        push(
             measure_items,
+            measure_seen,
             [
                 "Active-to-paid seat ratio",
             ],
         )
 
-    if args.country.upper() in EEA_COUNTRIES or "data-residency" in args.restrictions:
-        add_unique(
+    if is_eea or RESTRICTION_DATA_RESIDENCY in inputs.restrictions:
+        push(
             do_items,
+            do_seen,
             [
                 "Select compliant data-plane regions before optimization of unit rates.",
             ],
         )
-        add_unique(
+        push(
             avoid_items,
+            avoid_seen,
             [
                 "Do not choose lowest-cost regions that violate residency obligations.",
             ],
         )
-        add_unique(
+        push(
             measure_items,
+            measure_seen,
             [
                 "Policy exception count for residency controls",
             ],
         )
 
-    if any(r in args.restrictions for r in {"pci", "hipaa", "fedramp"}):
-        add_unique(
+    if inputs.restrictions & REGULATED_RESTRICTIONS:
+        push(
             do_items,
+            do_seen,
             [
                 "Model compliance boundary cost separately from general infrastructure spend.",
             ],
         )
-        add_unique(
+        push(
             avoid_items,
+            avoid_seen,
             [
                 "Do not bypass compliance segmentation to reduce short-term cost.",
             ],
         )
-        add_unique(
+        push(
             measure_items,
+            measure_seen,
             [
                 "Remediation time for non-compliant cost-critical services",
             ],
@@ -471,26 +500,26 @@ def build_correct_practices(args: argparse.Namespace) -> Dict[str, List[str]]:
     }
 
 
-def build_policy_boundaries(args: argparse.Namespace) -> List[str]:
+def build_policy_boundaries(inputs: CostInputs, is_eea: bool) -> List[str]:
     boundaries: List[str] = []
 
-    if args.country.upper() in EEA_COUNTRIES or "data-residency" in args.restrictions:
+    if is_eea or RESTRICTION_DATA_RESIDENCY in inputs.restrictions:
         boundaries.append(
             "Data residency boundary: keep data-plane services in approved in-country or in-region locations before cost tuning."
         )
-    if "pci" in args.restrictions:
+    if RESTRICTION_PCI in inputs.restrictions:
         boundaries.append(
             "PCI boundary: preserve segmentation and cardholder-data scoping; do not merge compliant and non-compliant paths for convenience."
         )
-    if "hipaa" in args.restrictions:
+    if RESTRICTION_HIPAA in inputs.restrictions:
         boundaries.append(
             "HIPAA boundary: maintain required safeguards and access controls; cost changes must preserve PHI protections."
         )
-    if "fedramp" in args.restrictions:
+    if RESTRICTION_FEDRAMP in inputs.restrictions:
         boundaries.append(
             "FedRAMP boundary: remain within authorized regions/services and keep audit trails for all spend-control changes."
         )
-    if "soc2" in args.restrictions:
+    if RESTRICTION_SOC2 in inputs.restrictions:
         boundaries.append(
             "SOC 2 boundary: maintain auditable ownership, change control, and exception workflows for cost-related decisions."
         )
@@ -503,19 +532,21 @@ def build_policy_boundaries(args: argparse.Namespace) -> List[str]:
     return boundaries
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args() -> Tuple[CostInputs, str]:
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Diagnose cost profile and generate ranked optimization actions."
     )
-    parser.add_argument("--monthly-budget-usd", type=float, default=0.0)
+    parser.add_argument("--monthly-budget-usd", type=finite_float, default=0.0)
     parser.add_argument(
         "--company-size",
-        choices=["solo", "startup", "smb", "mid-market", "enterprise"],
+        choices=COMPANY_SIZES,
         default="startup",
     )
     parser.add_argument(
         "--system-types",
-        default="api-saas",
+        default=SYSTEM_API_SAAS,
         help="Comma-separated list: api-saas,ecommerce,mobile-backend,data-platform,ml-batch,edge-iot,internal-tools",
     )
     parser.add_argument(
@@ -529,133 +560,188 @@ def parse_args() -> argparse.Namespace:
         help="Comma-separated list: aws,azure,gcp,multi,onprem-hybrid",
     )
     parser.add_argument("--country", default="US", help="Country code, for example US, DE, IN")
-    parser.add_argument("--monthly-requests", type=float, default=0.0)
-    parser.add_argument("--monthly-compute-hours", type=float, default=0.0)
-    parser.add_argument("--monthly-storage-gb", type=float, default=0.0)
-    parser.add_argument("--monthly-egress-gb", type=float, default=0.0)
-    parser.add_argument("--preload-ratio", type=float, default=0.0)
+    parser.add_argument("--monthly-requests", type=finite_float, default=0.0)
+    parser.add_argument("--monthly-compute-hours", type=finite_float, default=0.0)
+    parser.add_argument("--monthly-storage-gb", type=finite_float, default=0.0)
+    parser.add_argument("--monthly-egress-gb", type=finite_float, default=0.0)
+    parser.add_argument("--preload-ratio", type=finite_float, default=0.0)
     parser.add_argument("--postman-seats", type=int, default=0)
     parser.add_argument("--format", choices=["text", "json"], default="text")
 
     args = parser.parse_args()
-    args.system_types = parse_csv_set(args.system_types)
-    args.restrictions = parse_csv_set(args.restrictions)
-    args.clouds = parse_csv_set(args.clouds)
-    args.preload_ratio = min(max(args.preload_ratio, 0.0), 1.0)
-    return args
+    inputs = CostInputs(
+        monthly_budget_usd=args.monthly_budget_usd,
+        company_size=args.company_size,
+        system_types=args.system_types,
+        restrictions=args.restrictions,
+        clouds=args.clouds,
+        country=args.country,
+        monthly_requests=args.monthly_requests,
+        monthly_compute_hours=args.monthly_compute_hours,
+        monthly_storage_gb=args.monthly_storage_gb,
+        monthly_egress_gb=args.monthly_egress_gb,
+        preload_ratio=args.preload_ratio,
+        postman_seats=args.postman_seats,
+    )
+    return inputs, args.format
 
 
-def render_text(
+def _render_lines(
     summary: Dict[str, object],
-    actions: List[Dict[str, object]],
+    actions: List[Action],
     phases: Dict[str, List[str]],
     correct_practices: Dict[str, List[str]],
     policy_boundaries: List[str],
-) -> str:
-    lines: List[str] = []
-    lines.append("Cost Diagnosis")
-    lines.append("================")
-    lines.append(f"Budget tier: {summary['budget_tier']}")
-    lines.append(f"Country: {summary['country']}")
-    lines.append(f"Company size: {summary['company_size']}")
-    lines.append(f"System types: {', '.join(summary['system_types']) or 'none'}")
-    lines.append(f"Restrictions: {', '.join(summary['restrictions']) or 'none'}")
-    lines.append(f"Clouds: {', '.join(summary['clouds']) or 'none'}")
-
-    if summary["requests_per_compute_hour"] is not None:
-        lines.append(f"Requests per compute hour: {summary['requests_per_compute_hour']}")
-    if summary["egress_mb_per_1k_requests"] is not None:
-        lines.append(f"Egress MB per 1K requests: {summary['egress_mb_per_1k_requests']}")
-    if summary["cost_per_1m_requests_usd"] is not None:
-        lines.append(f"Cost per 1M requests (USD): {summary['cost_per_1m_requests_usd']}")
-
-    lines.append("")
-    lines.append("Risk Signals")
-    lines.append("------------")
-    if summary["signals"]:
-        for signal in summary["signals"]:
-            lines.append(f"- {signal}")
+) -> Iterator[str]:
+    tier = summary["budget_tier"]
+    country = summary["country"]
+    company_size = summary["company_size"]
+    system_types = ", ".join(summary["system_types"]) or "none"
+    restrictions = ", ".join(summary["restrictions"]) or "none"
+    clouds = ", ".join(summary["clouds"]) or "none"
+    req_per_compute_hour = summary["requests_per_compute_hour"]
+    egress_per_1k_requests_mb = summary["egress_mb_per_1k_requests"]
+    cost_per_1m_requests = summary["cost_per_1m_requests_usd"]
+    signals = summary["signals"]
+
+    yield "Cost Diagnosis"
+    yield "================"
+    yield f"Budget tier: {tier}"
+    yield f"Country: {country}"
+    yield f"Company size: {company_size}"
+    yield f"System types: {system_types}"
+    yield f"Restrictions: {restrictions}"
+    yield f"Clouds: {clouds}"
+
+    if req_per_compute_hour is not None:
+        yield f"Requests per compute hour: {req_per_compute_hour}"
+    if egress_per_1k_requests_mb is not None:
+        yield f"Egress MB per 1K requests: {egress_per_1k_requests_mb}"
+    if cost_per_1m_requests is not None:
+        yield f"Cost per 1M requests (USD): {cost_per_1m_requests}"
+
+    yield ""
+    yield "Risk Signals"
+    yield "------------"
+    if signals:
+        for signal in signals:
+            yield f"- {signal}"
     else:
-        lines.append("- none")
-
-    lines.append("")
-    lines.append("Ranked Actions")
-    lines.append("--------------")
-    for idx, action in enumerate(actions, 1):
-        lines.append(f"{idx}. {action['title']} (P{action['priority']})")
-        lines.append(f"   Why: {action['reason']}")
-        for step in action["steps"]:
-            lines.append(f"   - {step}")
-
-    lines.append("")
-    lines.append("90-Day Sequence")
-    lines.append("---------------")
+        yield "- none"
+
+    yield ""
+    yield "Ranked Actions"
+    yield "--------------"
+    for idx, (priority, title, reason, steps) in enumerate(actions, 1):
+        yield f"{idx}. {title} (P{priority})"
+        yield f"   Why: {reason}"
+        for step in steps:
+            yield f"   - {step}"
+
+    yield ""
+    yield "90-Day Sequence"
+    yield "---------------"
     for phase, titles in phases.items():
-        lines.append(f"{phase}:")
+        yield f"{phase}:"
         if titles:
             for title in titles:
-                lines.append(f"- {title}")
+                yield f"- {title}"
         else:
-            lines.append("- none")
+            yield "- none"
 
-    lines.append("")
-    lines.append("Correct Practices")
-    lines.append("-----------------")
-    lines.append("Do:")
+    yield ""
+    yield "Correct Practices"
+    yield "-----------------"
+    yield "Do:"
     for item in correct_practices["do"]:
-        lines.append(f"- {item}")
-    lines.append("Avoid:")
+        yield f"- {item}"
+    yield "Avoid:"
     for item in correct_practices["avoid"]:
-        lines.append(f"- {item}")
-    lines.append("Measure:")
+        yield f"- {item}"
+    yield "Measure:"
     for item in correct_practices["measure"]:
-        lines.append(f"- {item}")
+        yield f"- {item}"
 
-    lines.append("")
-    lines.append("Policy Boundaries")
-    lines.append("-----------------")
+    yield ""
+    yield "Policy Boundaries"
+    yield "-----------------"
     for item in policy_boundaries:
-        lines.append(f"- {item}")
+        yield f"- {item}"
 
-    return "\n".join(lines)
 
+def diagnose(inputs: CostInputs) -> Dict[str, object]:
+    tier = budget_tier(inputs.monthly_budget_usd)
+    is_eea = inputs.country in EEA_COUNTRIES
+    actions = build_actions(inputs, tier, is_eea)
+    return {
+        "summary": build_summary(inputs, tier, is_eea),
+        "actions": actions,
+        "phases": phase_actions(actions),
+        "correct_practices": build_correct_practices(inputs, is_eea),
+        "policy_boundaries": build_policy_boundaries(inputs, is_eea),
+    }
 
-def main() -> None:
-    args = parse_args()
-    tier = budget_tier(args.monthly_budget_usd)
-    summary = build_summary(args, tier)
-    actions = build_actions(args, tier)
-    phases = phase_actions(actions)
-    correct_practices = build_correct_practices(args)
-    policy_boundaries = build_policy_boundaries(args)
-
-    payload = {
+
+def report_to_payload(inputs: CostInputs, report: Dict[str, object]) -> Dict[str, object]:
+    summary = report["summary"]
+    return {
         "inputs": {
-            "monthly_budget_usd": args.monthly_budget_usd,
-            "company_size": args.company_size,
-            "system_types": sorted(args.system_types),
-            "restrictions": sorted(args.restrictions),
-            "clouds": sorted(args.clouds),
-            "country": args.country.upper(),
-            "monthly_requests": args.monthly_requests,
-            "monthly_compute_hours": args.monthly_compute_hours,
-            "monthly_storage_gb": args.monthly_storage_gb,
-            "monthly_egress_gb": args.monthly_egress_gb,
-            "preload_ratio": args.preload_ratio,
-            "postman_seats": args.postman_seats,
+            "monthly_budget_usd": inputs.monthly_budget_usd,
+            "company_size": inputs.company_size,
+            "system_types": summary["system_types"],
+            "restrictions": summary["restrictions"],
+            "clouds": summary["clouds"],
+            "country": inputs.country,
+            "monthly_requests": inputs.monthly_requests,
+            "monthly_compute_hours": inputs.monthly_compute_hours,
+            "monthly_storage_gb": inputs.monthly_storage_gb,
+            "monthly_egress_gb": inputs.monthly_egress_gb,
+            "preload_ratio": inputs.preload_ratio,
+            "postman_seats": inputs.postman_seats,
         },
-        "summary": summary,
-        "actions": actions,
-        "phases": phases,
-        "correct_practices": correct_practices,
-        "policy_boundaries": policy_boundaries,
+        **report,
+        "actions": [action._asdict() for action in report["actions"]],
     }
 
-    if args.format == "json":
-        print(json.dumps(payload, indent=2))
+
+def _orjson_dumps(payload: Dict[str, object]) -> Optional[bytes]:
+    if orjson is None:
+        return None
+    try:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    except orjson.JSONEncodeError:
+        return None
+
+
+def main() -> None:
+    inputs, output_format = parse_args()
+    report = diagnose(inputs)
+
+    if output_format == "json":
+        payload = report_to_payload(inputs, report)
+        encoded = _orjson_dumps(payload)
+        if encoded is None:
+            sys.stdout.write(json.dumps(payload, indent=2) + "\n")
+            return
+        buffer = getattr(sys.stdout, "buffer", None)
+        if buffer is None:
+            sys.stdout.write(encoded.decode())
+        else:
+            buffer.write(encoded)
         return
 
-    print(render_text(summary, actions, phases, correct_practices, policy_boundaries))
+    sys.stdout.write(
+        "\n".join(
+            _render_lines(
+                report["summary"],
+                report["actions"],
+                report["phases"],
+                report["correct_practices"],
+                report["policy_boundaries"],
+            )
+        )
+        + "\n"
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,80 @@
+import json
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+SCRIPT = SCRIPTS_DIR / "diagnose_cost_plan.py"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from diagnose_cost_plan import CostInputs, diagnose, report_to_payload  # noqa: E402
+
+
+def run_cli(*argv: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, str(SCRIPT), *argv, "--format", "json"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(result.stdout)
+
+
+def roundtrip(value: object) -> object:
+    return json.loads(json.dumps(value))
+
+
+class DiagnoseMatchesCliTest(unittest.TestCase):
+    def test_report_matches_cli_json(self) -> None:
+        cli = run_cli(
+            "--monthly-budget-usd", "12000",
+            "--company-size", "startup",
+            "--system-types", "api-saas,mobile-backend",
+            "--restrictions", "data-residency,PCI",
+            "--country", "de",
+            "--monthly-requests", "25000000",
+            "--monthly-compute-hours", "5000",
+            "--monthly-egress-gb", "4800",
+            "--preload-ratio", "0.28",
+            "--postman-seats", "14",
+        )
+        inputs = CostInputs(
+            monthly_budget_usd=12000,
+            company_size="startup",
+            system_types="api-saas,mobile-backend",
+            restrictions={"data-residency", " PCI "},
+            country="de",
+            monthly_requests=25_000_000,
+            monthly_compute_hours=5000,
+            monthly_egress_gb=4800,
+            preload_ratio=0.28,
+            postman_seats=14,
+        )
+
+        self.assertEqual(roundtrip(report_to_payload(inputs, diagnose(inputs))), cli)
+
+
+class CostInputsTest(unittest.TestCase):
+    def test_string_sets_are_parsed_like_the_cli(self) -> None:
+        inputs = CostInputs(restrictions="PCI, hipaa,", clouds=["AWS", " gcp", ""])
+        self.assertEqual(inputs.restrictions, {"pci", "hipaa"})
+        self.assertEqual(inputs.clouds, {"aws", "gcp"})
+
+    def test_uppercase_restriction_still_triggers_boundary(self) -> None:
+        report = diagnose(CostInputs(restrictions={"PCI"}))
+        self.assertTrue(report["policy_boundaries"][0].startswith("PCI boundary"))
+
+    def test_unknown_company_size_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            CostInputs(company_size="huge")
+
+    def test_non_finite_numbers_are_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            CostInputs(monthly_budget_usd=float("nan"))
+        with self.assertRaises(ValueError):
+            CostInputs(monthly_egress_gb=float("inf"))
+
+
+if __name__ == "__main__":
+    unittest.main()